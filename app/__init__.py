@@ -1,60 +1,34 @@
 from flask import Flask
 from flask_cors import CORS
+import re
 import traceback
-from pymongo import MongoClient
 from app.config import Config
 from app.routes.jwt_routes import bp as jwt_bp
 from app import extensions
+from app.utils.json_provider import ORJSONProvider
+
+# Database name in the path of a MongoDB URI: scheme://[user@]hosts/<db>?options
+_DB_NAME_RE = re.compile(r'^[^:]+://[^/]+/([^?]+)')
 
 def create_app(config_object=Config):
     app = Flask(__name__)
     app.config.from_object(config_object)
+    # Membership set for the per-request algorithm checks
+    app.config["ALLOWED_ALGORITHMS_SET"] = frozenset(app.config.get("ALLOWED_ALGORITHMS", ("HS256",)))
+    app.json = ORJSONProvider(app)
 
-    CORS(app, resources={r"/api/*": {"origins": "*"}})
+    # Long max_age lets browsers cache preflight responses for 24h
+    CORS(app, resources={r"/api/*": {"origins": "*", "methods": ["GET", "POST", "DELETE"], "max_age": 86400}})
 
-    # Initialize Flask-PyMongo with the app
-    if not app.config.get("MONGO_URI"):
+    # A precomputed MONGO_URI_RESOLVED is enough on its own
+    uri = app.config.get("MONGO_URI") or app.config.get("MONGO_URI_RESOLVED")
+    if uri:
+        _init_mongo(app, uri)
+    elif app.config.get("MONGO_REQUIRED", True):
         # Fail fast with a clear message if MONGO_URI is missing
-        raise RuntimeError("MONGO_URI is not set. Configure it via environment variables.")
-
-    # Initialize direct PyMongo client
-    uri = app.config.get("MONGO_URI", "")
-    if not uri:
-        raise RuntimeError("MONGO_URI is not set. Configure it via environment variables.")
-    
-    try:
-        # MongoDB connection - works with Railway MongoDB and MongoDB Atlas
-        extensions.client = MongoClient(
-            uri,
-            serverSelectionTimeoutMS=10000,
-            connectTimeoutMS=10000,
-            socketTimeoutMS=10000
-        )
-        
-        # Extract database name from URI or use default
-        if '/' in uri and '?' in uri:
-            # Format: mongodb://host:port/dbname?options
-            db_name = uri.split('/')[-1].split('?')[0]
-        elif uri.count('/') >= 3:
-            # Format: mongodb://host:port/dbname
-            db_name = uri.split('/')[-1]
-        else:
-            # No database in URI, use default
-            db_name = 'jwtdb'
-        
-        if not db_name or db_name == '':
-            db_name = 'jwtdb'
-            
-        extensions.db = extensions.client[db_name]
-        
-        # Test connection
-        extensions.db.command('ping')
-        print(f"✓ MongoDB connection successful to database: {db_name}")
-    except Exception as e:
-        print(f"✗ MongoDB connection FAILED: {type(e).__name__}: {str(e)[:200]}")
-        print("  → Recommended: Use Render's managed MongoDB instead of Atlas")
-        print("  → Create a MongoDB instance in Render dashboard and use its internal URI")
-        raise RuntimeError(f"MongoDB connection required but failed: {type(e).__name__}")
+        raise RuntimeError("MONGO_URI is not set (nor MONGO_URI_RESOLVED). Configure it via environment variables.")
+    else:
+        print("MONGO_URI is not set: test case storage is disabled")
 
     app.register_blueprint(jwt_bp)
 
@@ -72,10 +46,52 @@ def create_app(config_object=Config):
 
     @app.errorhandler(500)
     def server_error(e):
-        return {
-            "error": "Internal server error",
-            "detail": str(e),
-            "trace": traceback.format_exc()
-        }, 500
+        # Flask already logs the exception; only format it again for the
+        # response body when debugging
+        body = {"error": "Internal server error"}
+        if app.debug:
+            body["detail"] = str(e)
+            body["trace"] = traceback.format_exc()
+        return body, 500
+
+    # Build the URL map once all rules are registered so that, when the app
+    # is preloaded by gunicorn, workers inherit the compiled rules
+    app.url_map.update()
 
     return app
+
+
+def _init_mongo(app, uri):
+    """Configures the direct PyMongo client from the app config"""
+    # Imported here so a bare `import app` does not load DNS tooling
+    from app.utils.mongo_srv import resolve_srv_uri
+
+    # Extract database name from URI or use default
+    match = _DB_NAME_RE.match(uri)
+    db_name = match.group(1) if match else 'jwtdb'
+
+    # Prefer a URI precomputed at deploy time; otherwise resolve
+    # mongodb+srv:// once (cached on disk) so the client skips DNS
+    uri = app.config.get("MONGO_URI_RESOLVED") or resolve_srv_uri(uri, app.config.get("MONGO_SRV_CACHE"))
+
+    # MongoDB connection - works with Railway MongoDB and MongoDB Atlas
+    extensions.init_db(
+        uri,
+        db_name,
+        serverSelectionTimeoutMS=app.config["MONGO_SERVER_SELECTION_TIMEOUT_MS"],
+        connectTimeoutMS=app.config["MONGO_CONNECT_TIMEOUT_MS"],
+        socketTimeoutMS=app.config["MONGO_SOCKET_TIMEOUT_MS"],
+        waitQueueTimeoutMS=app.config["MONGO_WAIT_QUEUE_TIMEOUT_MS"],
+        maxPoolSize=app.config["MONGO_MAX_POOL_SIZE"],
+        minPoolSize=app.config["MONGO_MIN_POOL_SIZE"],
+        maxIdleTimeMS=app.config["MONGO_MAX_IDLE_TIME_MS"],
+        compressors=app.config["MONGO_COMPRESSORS"],
+        appname=app.config["MONGO_APPNAME"],
+        retryReads=True,
+        retryWrites=True
+    )
+
+    # Test connection off the startup path; the first query connects anyway
+    extensions.ping_on_startup = app.config["MONGO_PING_ON_STARTUP"]
+    if extensions.ping_on_startup and not extensions.preloading:
+        extensions.ping_in_background()
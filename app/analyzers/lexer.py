@@ -7,37 +7,207 @@ Delimiters: {.}
 Tokens: HEADER, DOT, PAYLOAD, DOT, SIGNATURE
 """
 import re
-from typing import List, Dict, Tuple
-from enum import Enum
+from typing import List, Dict, Optional, Tuple
+from enum import IntEnum
 
 
-class TokenType(Enum):
-    """Token types in a JWT"""
-    HEADER = "HEADER"
-    PAYLOAD = "PAYLOAD"
-    SIGNATURE = "SIGNATURE"
-    DOT = "DOT"
-    INVALID = "INVALID"
-    EOF = "EOF"
+# Base64URL alphabet and validation regex, compiled once at import time
+BASE64URL_ALPHABET = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_-')
+BASE64URL_REGEX = re.compile(r'^[A-Za-z0-9_-]+$')
+
+# Static description of the alphabet, built once instead of per analysis.
+# Kept as a plain dict (not a MappingProxyType) so it stays JSON-serializable
+_ALPHABET_INFO = {
+    "name": "Base64URL",
+    "size": len(BASE64URL_ALPHABET),
+    "symbols": {
+        "uppercase": "A-Z (26 symbols)",
+        "lowercase": "a-z (26 symbols)",
+        "digits": "0-9 (10 symbols)",
+        "special": "_ - (2 symbols)"
+    },
+    "alphabet": tuple(sorted(BASE64URL_ALPHABET)),
+    "regex": "^[A-Za-z0-9_-]+$"
+}
+
+# Longest input accepted by the lexer. RFC 7519 sets no limit; 8 KB covers
+# practical tokens (OIDC ID tokens included) and caps the work per request
+MAX_JWT_LEN = 8192
+
+# One Base64URL character, shared by the token regexes below
+_B64URL_CHAR = r'[A-Za-z0-9_-]'
+# Whole JWT in one pass: HEADER . PAYLOAD . SIGNATURE
+JWT_RE = re.compile(rf'({_B64URL_CHAR}+)\.({_B64URL_CHAR}+)\.({_B64URL_CHAR}+)')
+# Shape of a JWS compact token; the signature may be empty (unsecured JWT)
+JWT_SHAPE_RE = re.compile(rf'({_B64URL_CHAR}+)\.({_B64URL_CHAR}+)\.({_B64URL_CHAR}*)')
+
+# First character outside the alphabet, found in a single scan
+_INVALID_CHAR_RE = re.compile(r'[^A-Za-z0-9_-]')
+
+# Same alphabet as bytes: bytes.translate(None, _ALPHABET_BYTES) drops every
+# valid byte in one C pass, leaving only the invalid ones
+_ALPHABET_BYTES = ''.join(sorted(BASE64URL_ALPHABET)).encode('ascii')
+
+# Bytes allowed in a newline-joined batch of JWTs
+_BATCH_BYTES = _ALPHABET_BYTES + b'.\n'
+
+
+class TokenType(IntEnum):
+    """Token types in a JWT (int-valued; use .name for the readable form)"""
+    HEADER = 0
+    PAYLOAD = 1
+    SIGNATURE = 2
+    DOT = 3
+    INVALID = 4
+    EOF = 5
 
 
 class Token:
     """Represents a token identified by the lexical analyzer"""
+    __slots__ = ('type', 'value', 'position', 'length')
+    
     def __init__(self, token_type: TokenType, value: str, position: int):
         self.type = token_type
         self.value = value
         self.position = position
+        self.length = len(value)
     
     def to_dict(self):
         return {
-            "type": self.type.value,
+            "type": self.type.name,
             "value": self.value,
             "position": self.position,
-            "length": len(self.value)
+            "length": self.length
         }
     
     def __repr__(self):
-        return f"Token({self.type.value}, '{self.value[:20]}...', pos={self.position})"
+        return f"Token({self.type.name}, '{self.value[:20]}...', pos={self.position})"
+
+
+def tokenize(jwt: str) -> Tuple[List[Token], List[str]]:
+    """
+    Performs complete lexical analysis of a JWT
+    
+    Stateless (all state is local), so it needs no JWTLexer instance and
+    can be shared freely between requests and threads.
+    
+    Returns:
+        Tuple[List[Token], List[str]]: List of tokens and list of errors
+    """
+    tokens: List[Token] = []
+    errors: List[str] = []
+    
+    # Oversized inputs are rejected before anything is scanned or sliced
+    if len(jwt) > MAX_JWT_LEN:
+        errors.append(f"JWT too long: {len(jwt)} characters, maximum is {MAX_JWT_LEN}")
+        return tokens, errors
+    
+    # Fast path: a well-formed JWT is validated by a single regex match
+    # and its tokens are built straight from the group offsets
+    match = JWT_RE.fullmatch(jwt)
+    if match:
+        header_start, header_end = match.span(1)
+        payload_start, payload_end = match.span(2)
+        signature_start, signature_end = match.span(3)
+        tokens = [
+            Token(TokenType.HEADER, match.group(1), header_start),
+            Token(TokenType.DOT, '.', header_end),
+            Token(TokenType.PAYLOAD, match.group(2), payload_start),
+            Token(TokenType.DOT, '.', payload_end),
+            Token(TokenType.SIGNATURE, match.group(3), signature_start),
+            Token(TokenType.EOF, '', signature_end)
+        ]
+        return tokens, errors
+    
+    # Slow path: locate and report every lexical error. Separators are
+    # found with str.find instead of split(), so no list and no
+    # substrings are built until the shape is known
+    
+    # A JWT starts with a HEADER symbol (or, malformed, with an empty
+    # HEADER); any other first character is rejected outright
+    if jwt and jwt[0] != '.' and jwt[0] not in BASE64URL_ALPHABET:
+        errors.append(f"Invalid JWT: unexpected character {jwt[0]!r} at position 0")
+        return tokens, errors
+    
+    first_dot = jwt.find('.')
+    second_dot = jwt.find('.', first_dot + 1) if first_dot >= 0 else -1
+    current_pos = 0
+    
+    if second_dot < 0:
+        errors.append(f"Incomplete JWT: expected 3 parts, found {jwt.count('.') + 1}")
+        return tokens, errors
+    
+    # A third separator means the input can't be a JWT: stop before
+    # slicing anything out of it
+    if jwt.find('.', second_dot + 1) >= 0:
+        errors.append(f"Invalid JWT format: found {jwt.count('.') + 1} parts, expected 3")
+        return tokens, errors
+    
+    # Tokenize HEADER
+    header_part = jwt[:first_dot]
+    error = _check_segment("HEADER", header_part, current_pos)
+    if error is None:
+        header_tok = Token(TokenType.HEADER, header_part, current_pos)
+    else:
+        header_tok = Token(TokenType.INVALID, header_part, current_pos)
+        errors.append(error)
+    tokens.append(header_tok)
+    
+    current_pos += len(header_part)
+    
+    # First DOT
+    tokens.append(Token(TokenType.DOT, '.', current_pos))
+    current_pos += 1
+    
+    # Tokenize PAYLOAD
+    payload_part = jwt[first_dot + 1:second_dot]
+    error = _check_segment("PAYLOAD", payload_part, current_pos)
+    if error is None:
+        payload_tok = Token(TokenType.PAYLOAD, payload_part, current_pos)
+    else:
+        payload_tok = Token(TokenType.INVALID, payload_part, current_pos)
+        errors.append(error)
+    tokens.append(payload_tok)
+    
+    current_pos += len(payload_part)
+    
+    # Second DOT
+    tokens.append(Token(TokenType.DOT, '.', current_pos))
+    current_pos += 1
+    
+    # Tokenize SIGNATURE
+    signature_part = jwt[second_dot + 1:]
+    error = _check_segment("SIGNATURE", signature_part, current_pos)
+    if error is None:
+        signature_tok = Token(TokenType.SIGNATURE, signature_part, current_pos)
+    else:
+        signature_tok = Token(TokenType.INVALID, signature_part, current_pos)
+        errors.append(error)
+    tokens.append(signature_tok)
+    
+    current_pos += len(signature_part)
+    
+    # EOF
+    tokens.append(Token(TokenType.EOF, '', current_pos))
+    
+    return tokens, errors
+
+
+def _check_segment(name: str, text: str, start: int) -> Optional[str]:
+    """
+    Validates a segment against ^[A-Za-z0-9_-]+$ in a single pass,
+    stopping at the first invalid character
+    
+    Returns:
+        None if text is valid, otherwise the error message
+    """
+    if not text:
+        return f"{name} is empty at position {start}"
+    invalid = _INVALID_CHAR_RE.search(text)
+    if invalid is None:
+        return None
+    index = invalid.start()
+    return f"{name} contains invalid character {text[index]!r} at position {start + index}"
 
 
 class JWTLexer:
@@ -50,108 +220,49 @@ class JWTLexer:
     """
     
     # Regular expression to validate Base64URL characters
-    BASE64URL_PATTERN = re.compile(r'^[A-Za-z0-9_-]+$')
+    BASE64URL_PATTERN = BASE64URL_REGEX
     
     # Valid Base64URL alphabet
-    ALPHABET = set('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_-')
+    ALPHABET = BASE64URL_ALPHABET
     
     def __init__(self, jwt_string: str):
         self.input = jwt_string
         self.position = 0
         self.tokens: List[Token] = []
         self.errors: List[str] = []
+        # (HEADER, PAYLOAD, SIGNATURE) tokens once all three are found
+        self.segments: Optional[Tuple[Token, Token, Token]] = None
     
     def tokenize(self) -> Tuple[List[Token], List[str]]:
         """
-        Performs complete lexical analysis of JWT
+        Performs complete lexical analysis of JWT (see module-level tokenize)
         
         Returns:
             Tuple[List[Token], List[str]]: List of tokens and list of errors
         """
-        parts = self.input.split('.')
-        current_pos = 0
-        
-        if len(parts) < 3:
-            self.errors.append(f"Incomplete JWT: expected 3 parts, found {len(parts)}")
-            return self.tokens, self.errors
-        
-        if len(parts) > 3:
-            self.errors.append(f"Invalid JWT format: found {len(parts)} parts, expected 3")
-        
-        # Tokenize HEADER
-        header_part = parts[0]
-        if self._is_valid_base64url(header_part):
-            self.tokens.append(Token(TokenType.HEADER, header_part, current_pos))
-        else:
-            self.tokens.append(Token(TokenType.INVALID, header_part, current_pos))
-            invalid_chars = self._find_invalid_chars(header_part)
-            self.errors.append(f"HEADER contains invalid characters at position {current_pos}: {invalid_chars}")
-        
-        current_pos += len(header_part)
-        
-        # First DOT
-        self.tokens.append(Token(TokenType.DOT, '.', current_pos))
-        current_pos += 1
-        
-        # Tokenize PAYLOAD
-        payload_part = parts[1]
-        if self._is_valid_base64url(payload_part):
-            self.tokens.append(Token(TokenType.PAYLOAD, payload_part, current_pos))
-        else:
-            self.tokens.append(Token(TokenType.INVALID, payload_part, current_pos))
-            invalid_chars = self._find_invalid_chars(payload_part)
-            self.errors.append(f"PAYLOAD contains invalid characters at position {current_pos}: {invalid_chars}")
-        
-        current_pos += len(payload_part)
-        
-        # Second DOT
-        self.tokens.append(Token(TokenType.DOT, '.', current_pos))
-        current_pos += 1
-        
-        # Tokenize SIGNATURE
-        signature_part = parts[2]
-        if self._is_valid_base64url(signature_part):
-            self.tokens.append(Token(TokenType.SIGNATURE, signature_part, current_pos))
-        else:
-            self.tokens.append(Token(TokenType.INVALID, signature_part, current_pos))
-            invalid_chars = self._find_invalid_chars(signature_part)
-            self.errors.append(f"SIGNATURE contains invalid characters at position {current_pos}: {invalid_chars}")
-        
-        current_pos += len(signature_part)
-        
-        # EOF
-        self.tokens.append(Token(TokenType.EOF, '', current_pos))
-        
+        self.tokens, self.errors = tokenize(self.input)
+        # Either no tokens or the full HEADER . PAYLOAD . SIGNATURE EOF shape
+        if self.tokens:
+            self.segments = (self.tokens[0], self.tokens[2], self.tokens[4])
         return self.tokens, self.errors
     
-    def _is_valid_base64url(self, text: str) -> bool:
+    @staticmethod
+    def tokenize_batch(jwts: List[str]) -> List[bool]:
         """
-        Validates if text matches Base64URL regular expression
-        Expression: ^[A-Za-z0-9_-]+$
+        Bulk counterpart of tokenize for log replay and audit tools: only
+        reports, per input, whether it is a well-formed JWT (no tokens or
+        error messages are built). See validate_batch.
         """
-        if not text:
-            return False
-        return bool(self.BASE64URL_PATTERN.match(text))
+        return validate_batch(jwts)
     
-    def _find_invalid_chars(self, text: str) -> str:
-        """Finds characters that don't belong to Base64URL alphabet"""
-        invalid = [ch for ch in text if ch not in self.ALPHABET]
-        return str(set(invalid)) if invalid else "none"
-    
-    def get_alphabet_info(self) -> Dict:
-        """Returns information about Base64URL alphabet"""
-        return {
-            "name": "Base64URL",
-            "size": len(self.ALPHABET),
-            "symbols": {
-                "uppercase": "A-Z (26 symbols)",
-                "lowercase": "a-z (26 symbols)",
-                "digits": "0-9 (10 symbols)",
-                "special": "_ - (2 symbols)"
-            },
-            "alphabet": sorted(list(self.ALPHABET)),
-            "regex": "^[A-Za-z0-9_-]+$"
-        }
+    @staticmethod
+    def get_alphabet_info() -> Dict:
+        """
+        Returns information about Base64URL alphabet. The same module-level
+        dict is returned on every call (no copy), so callers must not
+        mutate it or anything inside it
+        """
+        return _ALPHABET_INFO
     
     def analyze(self) -> Dict:
         """
@@ -159,17 +270,47 @@ class JWTLexer:
         """
         tokens, errors = self.tokenize()
         
+        if self.segments is not None:
+            header_tok, payload_tok, signature_tok = self.segments
+            header_length, payload_length, signature_length = (
+                header_tok.length, payload_tok.length, signature_tok.length
+            )
+        else:
+            header_length = payload_length = signature_length = 0
+        
         return {
             "phase": "Lexical Analysis",
-            "success": len(errors) == 0,
+            "success": not errors,
             "tokens": [t.to_dict() for t in tokens],
             "token_count": len(tokens),
             "errors": errors,
             "alphabet": self.get_alphabet_info(),
             "statistics": {
-                "header_length": len(self.tokens[0].value) if len(self.tokens) > 0 else 0,
-                "payload_length": len(self.tokens[2].value) if len(self.tokens) > 2 else 0,
-                "signature_length": len(self.tokens[4].value) if len(self.tokens) > 4 else 0,
+                "header_length": header_length,
+                "payload_length": payload_length,
+                "signature_length": signature_length,
                 "total_length": len(self.input)
             }
         }
+
+
+def validate_batch(jwts: List[str]) -> List[bool]:
+    """
+    Checks the shape of many JWTs at once: True for each input made of
+    three non-empty Base64URL segments separated by '.' and no longer
+    than MAX_JWT_LEN
+
+    The whole batch is joined and its characters validated with a single
+    bytes.translate pass; only the per-token dot layout is checked
+    individually. Batches containing invalid characters fall back to a
+    regex match per token.
+    """
+    joined = '\n'.join(jwts)
+    if (joined.isascii() and joined.count('\n') == len(jwts) - 1
+            and not joined.encode('ascii').translate(None, _BATCH_BYTES)):
+        return [
+            len(jwt) <= MAX_JWT_LEN and jwt.count('.') == 2 and '..' not in jwt
+            and not jwt.startswith('.') and not jwt.endswith('.')
+            for jwt in jwts
+        ]
+    return [len(jwt) <= MAX_JWT_LEN and JWT_RE.fullmatch(jwt) is not None for jwt in jwts]
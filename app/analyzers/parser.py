@@ -16,23 +16,57 @@ Productions (P):
 4. SIGNATURE → BASE64URL_STRING
 5. BASE64URL_STRING → [A-Za-z0-9_-]+
 """
-from typing import Dict, List, Tuple
-from app.analyzers.lexer import JWTLexer, TokenType, Token
+from typing import Dict, List, Optional, Sequence, Tuple
+from app.analyzers.lexer import JWTLexer, TokenType, Token, MAX_JWT_LEN, JWT_RE
+
+
+# Static grammar description, built once at import instead of per analysis
+_GRAMMAR_INFO = {
+    "type": "Context-Free Grammar (CFG)",
+    "parser_type": "Recursive Descent LL(1)",
+    "start_symbol": "JWT",
+    "non_terminals": ("JWT", "HEADER", "PAYLOAD", "SIGNATURE", "BASE64URL_STRING"),
+    "terminals": ("[A-Za-z0-9_-]", "."),
+    "productions": (
+        "JWT → HEADER . PAYLOAD . SIGNATURE",
+        "HEADER → BASE64URL_STRING",
+        "PAYLOAD → BASE64URL_STRING",
+        "SIGNATURE → BASE64URL_STRING",
+        "BASE64URL_STRING → [A-Za-z0-9_-]+"
+    )
+}
+
+# Token sequence derived from Production 1, with the error reported when a
+# separator or the end of input is missing (None for the segments)
+_EXPECTED_SEQUENCE = (
+    (TokenType.HEADER, None),
+    (TokenType.DOT, "Missing first separator '.' after HEADER"),
+    (TokenType.PAYLOAD, None),
+    (TokenType.DOT, "Missing second separator '.' after PAYLOAD"),
+    (TokenType.SIGNATURE, None),
+    (TokenType.EOF, "Found additional characters after valid JWT")
+)
+
+
+# Children of every terminal node: one shared empty tuple, not a list each
+_NO_CHILDREN = ()
 
 
 class ParseNode:
     """Parse tree node"""
-    def __init__(self, symbol: str, value: str = "", children: List['ParseNode'] = None):
+    def __init__(self, symbol: str, value: str = "", children: Sequence['ParseNode'] = None):
         self.symbol = symbol  # Non-terminal or terminal
         self.value = value    # Token value (for terminals)
-        self.children = children or []
+        self.children = children or _NO_CHILDREN
     
     def to_dict(self):
+        if not self.children:
+            return {"symbol": self.symbol, "value": self.value, "children": [], "is_terminal": True}
         return {
             "symbol": self.symbol,
             "value": self.value,
             "children": [child.to_dict() for child in self.children],
-            "is_terminal": len(self.children) == 0
+            "is_terminal": False
         }
 
 
@@ -41,7 +75,9 @@ class JWTParser:
     Recursive Descent Syntactic Analyzer for JWT
     
     Implements an LL(1) parser that validates JWT syntactic structure
-    according to the defined context-free grammar.
+    according to the defined context-free grammar. With a single
+    fixed-shape production, the descent reduces to checking the token
+    stream against the expected sequence.
     """
     
     def __init__(self, tokens: List[Token]):
@@ -67,141 +103,54 @@ class JWTParser:
             return self.tokens[self.current]
         return Token(TokenType.EOF, '', -1)
     
-    def _consume(self, expected_type: TokenType) -> Token:
-        """Consumes a token of expected type"""
-        token = self._current_token()
-        if token.type != expected_type:
-            self.errors.append(
-                f"Syntax error at position {token.position}: "
-                f"expected {expected_type.value}, found {token.type.value}"
-            )
-            return None
-        self.current += 1
-        return token
-    
     def _parse_jwt(self) -> ParseNode:
         """
         Production 1: JWT → HEADER . PAYLOAD . SIGNATURE
         Start symbol of grammar
-        """
-        jwt_node = ParseNode("JWT", "")
-        
-        # HEADER
-        header_node = self._parse_header()
-        if header_node is None:
-            return None
-        jwt_node.children.append(header_node)
-        
-        # First DOT
-        dot1 = self._consume(TokenType.DOT)
-        if dot1 is None:
-            self.errors.append("Missing first separator '.' after HEADER")
-            return None
-        jwt_node.children.append(ParseNode("DOT", "."))
-        
-        # PAYLOAD
-        payload_node = self._parse_payload()
-        if payload_node is None:
-            return None
-        jwt_node.children.append(payload_node)
-        
-        # Second DOT
-        dot2 = self._consume(TokenType.DOT)
-        if dot2 is None:
-            self.errors.append("Missing second separator '.' after PAYLOAD")
-            return None
-        jwt_node.children.append(ParseNode("DOT", "."))
         
-        # SIGNATURE
-        signature_node = self._parse_signature()
-        if signature_node is None:
-            return None
-        jwt_node.children.append(signature_node)
-        
-        # Verify EOF
-        eof = self._consume(TokenType.EOF)
-        if eof is None:
-            self.errors.append("Found additional characters after valid JWT")
-            return None
-        
-        return jwt_node
-    
-    def _parse_header(self) -> ParseNode:
+        The grammar has a single production of fixed shape, so parsing is a
+        straight walk over the expected token sequence (table-driven) rather
+        than one method call per rule
         """
-        Production 2: HEADER → BASE64URL_STRING
-        """
-        token = self._current_token()
-        if token.type == TokenType.INVALID:
-            self.errors.append(f"Invalid HEADER at position {token.position}: contains non-Base64URL characters")
+        for expected_type, missing_message in _EXPECTED_SEQUENCE:
+            token = self._current_token()
+            if token.type is not expected_type:
+                if missing_message is not None:
+                    # Separator or end of input
+                    self.errors.append(
+                        f"Syntax error at position {token.position}: "
+                        f"expected {expected_type.name}, found {token.type.name}"
+                    )
+                    self.errors.append(missing_message)
+                elif token.type is TokenType.INVALID:
+                    # Productions 2-4: segment with non-Base64URL characters
+                    self.errors.append(
+                        f"Invalid {expected_type.name} at position {token.position}: "
+                        f"contains non-Base64URL characters"
+                    )
+                    self.current += 1
+                else:
+                    self.errors.append(f"Expected {expected_type.name}, found {token.type.name}")
+                return None
             self.current += 1
-            return None
-        
-        if token.type != TokenType.HEADER:
-            self.errors.append(f"Expected HEADER, found {token.type.value}")
-            return None
         
-        self.current += 1
-        header_node = ParseNode("HEADER", "")
-        base64_node = ParseNode("BASE64URL_STRING", token.value)
-        header_node.children.append(base64_node)
-        return header_node
+        # Productions 2-5: each segment → BASE64URL_STRING
+        header, payload, signature = self.tokens[0], self.tokens[2], self.tokens[4]
+        return ParseNode("JWT", "", [
+            ParseNode("HEADER", "", [ParseNode("BASE64URL_STRING", header.value)]),
+            ParseNode("DOT", "."),
+            ParseNode("PAYLOAD", "", [ParseNode("BASE64URL_STRING", payload.value)]),
+            ParseNode("DOT", "."),
+            ParseNode("SIGNATURE", "", [ParseNode("BASE64URL_STRING", signature.value)])
+        ])
     
-    def _parse_payload(self) -> ParseNode:
+    @staticmethod
+    def get_grammar_info() -> Dict:
         """
-        Production 3: PAYLOAD → BASE64URL_STRING
+        Returns grammar information. The same module-level dict is
+        returned on every call (no copy), so callers must not mutate it
         """
-        token = self._current_token()
-        if token.type == TokenType.INVALID:
-            self.errors.append(f"Invalid PAYLOAD at position {token.position}: contains non-Base64URL characters")
-            self.current += 1
-            return None
-        
-        if token.type != TokenType.PAYLOAD:
-            self.errors.append(f"Expected PAYLOAD, found {token.type.value}")
-            return None
-        
-        self.current += 1
-        payload_node = ParseNode("PAYLOAD", "")
-        base64_node = ParseNode("BASE64URL_STRING", token.value)
-        payload_node.children.append(base64_node)
-        return payload_node
-    
-    def _parse_signature(self) -> ParseNode:
-        """
-        Production 4: SIGNATURE → BASE64URL_STRING
-        """
-        token = self._current_token()
-        if token.type == TokenType.INVALID:
-            self.errors.append(f"Invalid SIGNATURE at position {token.position}: contains non-Base64URL characters")
-            self.current += 1
-            return None
-        
-        if token.type != TokenType.SIGNATURE:
-            self.errors.append(f"Expected SIGNATURE, found {token.type.value}")
-            return None
-        
-        self.current += 1
-        signature_node = ParseNode("SIGNATURE", "")
-        base64_node = ParseNode("BASE64URL_STRING", token.value)
-        signature_node.children.append(base64_node)
-        return signature_node
-    
-    def get_grammar_info(self) -> Dict:
-        """Returns grammar information"""
-        return {
-            "type": "Context-Free Grammar (CFG)",
-            "parser_type": "Recursive Descent LL(1)",
-            "start_symbol": "JWT",
-            "non_terminals": ["JWT", "HEADER", "PAYLOAD", "SIGNATURE", "BASE64URL_STRING"],
-            "terminals": ["[A-Za-z0-9_-]", "."],
-            "productions": [
-                "JWT → HEADER . PAYLOAD . SIGNATURE",
-                "HEADER → BASE64URL_STRING",
-                "PAYLOAD → BASE64URL_STRING",
-                "SIGNATURE → BASE64URL_STRING",
-                "BASE64URL_STRING → [A-Za-z0-9_-]+"
-            ]
-        }
+        return _GRAMMAR_INFO
     
     def analyze(self) -> Dict:
         """
@@ -217,3 +166,84 @@ class JWTParser:
             "errors": errors,
             "tokens_consumed": self.current
         }
+
+
+def _segment_node(symbol: str, value: str) -> Dict:
+    """Parse tree dict for HEADER/PAYLOAD/SIGNATURE → BASE64URL_STRING"""
+    return {
+        "symbol": symbol,
+        "value": "",
+        "children": [{"symbol": "BASE64URL_STRING", "value": value, "children": [], "is_terminal": True}],
+        "is_terminal": False
+    }
+
+
+def analyze_fused(jwt: str) -> Tuple[Dict, Optional[Dict]]:
+    """
+    Runs lexical and syntactic analysis in a single pass
+    
+    The grammar has a single fixed-shape production, so once the whole
+    input matches HEADER . PAYLOAD . SIGNATURE both results can be built
+    directly from the match, without Token or ParseNode objects. Output
+    is identical to JWTLexer.analyze() followed by JWTParser.analyze().
+    
+    Returns:
+        Tuple[Dict, Optional[Dict]]: Lexical result and syntactic result
+        (None when lexical analysis fails)
+    """
+    match = JWT_RE.fullmatch(jwt) if len(jwt) <= MAX_JWT_LEN else None
+    if match is None:
+        lexer = JWTLexer(jwt)
+        lexical = lexer.analyze()
+        if not lexical["success"]:
+            return lexical, None
+        return lexical, JWTParser(lexer.tokens).analyze()
+    
+    header, payload, signature = match.groups()
+    header_start, header_end = match.span(1)
+    payload_start, payload_end = match.span(2)
+    signature_start, signature_end = match.span(3)
+    
+    lexical = {
+        "phase": "Lexical Analysis",
+        "success": True,
+        "tokens": [
+            {"type": "HEADER", "value": header, "position": header_start, "length": header_end - header_start},
+            {"type": "DOT", "value": ".", "position": header_end, "length": 1},
+            {"type": "PAYLOAD", "value": payload, "position": payload_start, "length": payload_end - payload_start},
+            {"type": "DOT", "value": ".", "position": payload_end, "length": 1},
+            {"type": "SIGNATURE", "value": signature, "position": signature_start, "length": signature_end - signature_start},
+            {"type": "EOF", "value": "", "position": signature_end, "length": 0}
+        ],
+        "token_count": 6,
+        "errors": [],
+        "alphabet": JWTLexer.get_alphabet_info(),
+        "statistics": {
+            "header_length": header_end - header_start,
+            "payload_length": payload_end - payload_start,
+            "signature_length": signature_end - signature_start,
+            "total_length": len(jwt)
+        }
+    }
+    
+    syntactic = {
+        "phase": "Syntactic Analysis",
+        "success": True,
+        "grammar": JWTParser.get_grammar_info(),
+        "parse_tree": {
+            "symbol": "JWT",
+            "value": "",
+            "children": [
+                _segment_node("HEADER", header),
+                {"symbol": "DOT", "value": ".", "children": [], "is_terminal": True},
+                _segment_node("PAYLOAD", payload),
+                {"symbol": "DOT", "value": ".", "children": [], "is_terminal": True},
+                _segment_node("SIGNATURE", signature)
+            ],
+            "is_terminal": False
+        },
+        "errors": [],
+        "tokens_consumed": 6
+    }
+    
+    return lexical, syntactic
@@ -9,34 +9,266 @@ Validations:
 4. Temporal validation (exp, nbf, iat)
 5. Symbol table (claims registry)
 """
-import json
-import base64
-from datetime import datetime, timezone
-from typing import Dict, List, Any, Tuple
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Tuple
+
+
+# Registered standard claims (RFC 7519)
+STANDARD_CLAIMS = {
+    "iss": {"type": str, "description": "Issuer", "required": False},
+    "sub": {"type": str, "description": "Subject", "required": False},
+    "aud": {"type": (str, list), "description": "Audience", "required": False},
+    "exp": {"type": int, "description": "Expiration Time", "required": False},
+    "nbf": {"type": int, "description": "Not Before", "required": False},
+    "iat": {"type": int, "description": "Issued At", "required": False},
+    "jti": {"type": str, "description": "JWT ID", "required": False}
+}
+
+# Required header fields
+REQUIRED_HEADER_FIELDS = {
+    "typ": {"type": str, "description": "Token Type", "expected": "JWT"},
+    "alg": {"type": str, "description": "Algorithm", "allowed": ["HS256", "HS384", "HS512", "RS256", "RS384", "RS512", "ES256", "ES384", "ES512", "none"]}
+}
+
+# Marks an absent claim in dict.get, where None is a valid claim value
+_MISSING = object()
+
+# Membership sets for the per-claim lookups, built once at import
+_HEADER_STANDARD_CLAIMS = frozenset(("typ", "alg", "kid"))
+_STANDARD_CLAIM_KEYS = frozenset(STANDARD_CLAIMS)
+_ALLOWED_ALGS = frozenset(REQUIRED_HEADER_FIELDS["alg"]["allowed"])
+
+# Standard claim -> (accepted types as a tuple, expected type as shown
+# in error messages), so a single isinstance call covers every claim
+_CLAIM_EXPECTED: Dict[str, Tuple[tuple, str]] = {
+    claim: (info["type"], str(info["type"])) if isinstance(info["type"], tuple)
+    else ((info["type"],), info["type"].__name__)
+    for claim, info in STANDARD_CLAIMS.items()
+}
+
+
+def _check_exp(exp: int, now: float, errors: List[str], warnings: List[str]):
+    """Validates expiration (exp)"""
+    if exp < now:
+        errors.append(f"Token expired: exp={exp}, now={int(now)}")
+
+
+def _check_nbf(nbf: int, now: float, errors: List[str], warnings: List[str]):
+    """Validates not before (nbf)"""
+    if nbf > now:
+        errors.append(f"Token not yet valid: nbf={nbf}, now={int(now)}")
+
+
+def _check_iat(iat: int, now: float, errors: List[str], warnings: List[str]):
+    """Validates issued at (iat)"""
+    if iat > now:
+        warnings.append(f"Claim 'iat' is in the future: iat={iat}, now={int(now)}")
+
+
+# Temporal restriction of each time claim, applied once its type is checked
+_TEMPORAL_CHECKS = {"exp": _check_exp, "nbf": _check_nbf, "iat": _check_iat}
+
+
+@dataclass(slots=True)
+class Symbol:
+    """Symbol table entry: a claim and its information"""
+    name: str
+    value: Any
+    type: str
+    claim_type: str  # "standard", "public", "private"
+    scope: str  # "header", "payload"
+    
+    def to_dict(self) -> Dict:
+        # Built by hand: dataclasses.asdict would deep-copy the claim value
+        return {
+            "name": self.name,
+            "value": self.value,
+            "type": self.type,
+            "claim_type": self.claim_type,
+            "scope": self.scope
+        }
 
 
 class SymbolTable:
     """Symbol table to store claims and their information"""
+    __slots__ = ('symbols', 'counts')
+    
     def __init__(self):
-        self.symbols: Dict[str, Dict] = {}
+        self.symbols: Dict[str, Symbol] = {}
+        # Number of symbols per claim type, kept up to date by add_symbol
+        self.counts: Dict[str, int] = {"standard": 0, "public": 0, "private": 0}
     
     def add_symbol(self, name: str, value: Any, claim_type: str, scope: str):
         """Adds a symbol (claim) to the table"""
-        self.symbols[name] = {
-            "name": name,
-            "value": value,
-            "type": type(value).__name__,
-            "claim_type": claim_type,  # "standard", "public", "private"
-            "scope": scope  # "header", "payload"
-        }
+        previous = self.symbols.get(name)
+        if previous is not None:
+            # A payload claim replaces a header field of the same name
+            self.counts[previous.claim_type] -= 1
+        self.counts[claim_type] += 1
+        self.symbols[name] = Symbol(name, value, type(value).__name__, claim_type, scope)
     
-    def get_symbol(self, name: str) -> Dict:
+    def get_symbol(self, name: str) -> Optional[Symbol]:
         """Gets information about a symbol"""
         return self.symbols.get(name)
     
     def to_dict(self) -> List[Dict]:
         """Converts table to list of dictionaries"""
-        return list(self.symbols.values())
+        return [symbol.to_dict() for symbol in self.symbols.values()]
+
+
+def analyze_semantics(header: Dict, payload: Dict) -> Dict:
+    """
+    Performs complete semantic analysis of a decoded JWT
+    
+    Stateless: errors, warnings and the symbol table are local to the
+    call, so no JWTSemanticAnalyzer instance is needed.
+    """
+    return _analyze(header, payload, [], [], SymbolTable())
+
+
+def _analyze(header: Dict, payload: Dict, errors: List[str], warnings: List[str],
+             symbol_table: SymbolTable) -> Dict:
+    """Runs every semantic check, filling the given containers"""
+    # Build symbol table
+    _build_symbol_table(header, payload, symbol_table)
+    
+    # Validate header
+    header_valid = _validate_header(header, errors, warnings)
+    
+    # Validate payload, data types and temporal restrictions
+    payload_valid, types_valid, temporal_valid = _validate_claims(header, payload, errors, warnings)
+    
+    return {
+        "phase": "Semantic Analysis",
+        "success": not errors,
+        "validations": {
+            "header": header_valid,
+            "payload": payload_valid,
+            "types": types_valid,
+            "temporal": temporal_valid
+        },
+        "symbol_table": symbol_table.to_dict(),
+        "errors": errors,
+        "warnings": warnings,
+        "statistics": {
+            "total_claims": len(symbol_table.symbols),
+            "standard_claims": symbol_table.counts["standard"],
+            "private_claims": symbol_table.counts["private"]
+        }
+    }
+
+
+def _build_symbol_table(header: Dict, payload: Dict, symbol_table: SymbolTable):
+    """Builds symbol table with all claims"""
+    # Add header symbols
+    for key, value in header.items():
+        claim_type = "standard" if key in _HEADER_STANDARD_CLAIMS else "private"
+        symbol_table.add_symbol(key, value, claim_type, "header")
+    
+    # Add payload symbols
+    for key, value in payload.items():
+        claim_type = "standard" if key in _STANDARD_CLAIM_KEYS else "private"
+        symbol_table.add_symbol(key, value, claim_type, "payload")
+
+
+def _validate_header(header: Dict, errors: List[str], warnings: List[str]) -> bool:
+    """Validates required fields and header structure"""
+    valid = True
+    
+    # Validate 'typ' field
+    typ = header.get("typ", _MISSING)
+    if typ is _MISSING:
+        warnings.append("Missing 'typ' field in header (recommended: 'JWT')")
+    elif typ != "JWT":
+        warnings.append(f"Field 'typ' has value '{typ}', expected 'JWT'")
+    
+    # Validate 'alg' field (REQUIRED)
+    alg = header.get("alg", _MISSING)
+    if alg is _MISSING:
+        errors.append("Required field 'alg' missing in header")
+        valid = False
+    else:
+        # Non-string values (possibly unhashable) are never a known algorithm
+        if not isinstance(alg, str) or alg not in _ALLOWED_ALGS:
+            allowed_algs = REQUIRED_HEADER_FIELDS["alg"]["allowed"]
+            errors.append(f"Algorithm '{alg}' not recognized. Valid algorithms: {allowed_algs}")
+            valid = False
+    
+    return valid
+
+
+def _validate_claims(header: Dict, payload: Dict, errors: List[str], warnings: List[str]) -> Tuple[bool, bool, bool]:
+    """
+    Validates payload claims, data types and temporal restrictions
+    (exp, nbf, iat) in a single pass over the payload
+    
+    Returns:
+        Tuple[bool, bool, bool]: payload, types and temporal validity
+    """
+    payload_errors: List[str] = []
+    type_errors: List[str] = []
+    temporal_errors: List[str] = []
+    # Time claims that passed their int check, for the ordering rule
+    times: Dict[str, int] = {}
+    now = time.time()
+    
+    # Validate types in header
+    for key, value in header.items():
+        if key in REQUIRED_HEADER_FIELDS:
+            expected_type = REQUIRED_HEADER_FIELDS[key]["type"]
+            if not isinstance(value, expected_type):
+                type_errors.append(f"Header.{key} has incorrect type: {type(value).__name__}, expected {expected_type.__name__}")
+    
+    # Validate non-empty payload: without claims there is nothing else to check
+    if not payload:
+        warnings.append("Empty payload: contains no claims")
+        warnings.append("Token without 'exp' claim: cannot validate expiration")
+        errors.extend(type_errors)
+        return True, not type_errors, True
+    
+    if "exp" not in payload:
+        warnings.append("Token without 'exp' claim: cannot validate expiration")
+    
+    # Validate present standard claims: type, then temporal restriction
+    for claim, value in payload.items():
+        expected = _CLAIM_EXPECTED.get(claim)
+        if expected is None:
+            continue
+        
+        # Type names are only needed for error messages: valid claims
+        # never look them up
+        expected_types, expected_name = expected
+        found = None
+        if not isinstance(value, expected_types):
+            found = type(value).__name__
+            payload_errors.append(f"Claim '{claim}' has incorrect type: {found}, expected {expected_name}")
+        
+        check = _TEMPORAL_CHECKS.get(claim)
+        if check is not None:
+            # Time claims expect (int,): the type check above already decided
+            if found is None:
+                times[claim] = value
+                check(value, now, temporal_errors, warnings)
+            else:
+                type_errors.append(f"Temporal claim '{claim}' must be int (Unix timestamp), found {found}")
+                temporal_errors.append(f"Claim '{claim}' must be a Unix timestamp (int), found {found}")
+    
+    # Validate temporal order: iat < nbf < exp
+    if len(times) == 3:
+        iat = times["iat"]
+        nbf = times["nbf"]
+        exp = times["exp"]
+        
+        if not (iat <= nbf <= exp):
+            temporal_errors.append(f"Invalid temporal order: must satisfy iat <= nbf <= exp, found iat={iat}, nbf={nbf}, exp={exp}")
+    
+    # Same error order as validating payload, types and time separately
+    errors.extend(payload_errors)
+    errors.extend(type_errors)
+    errors.extend(temporal_errors)
+    
+    return not payload_errors, not type_errors, not temporal_errors
 
 
 class JWTSemanticAnalyzer:
@@ -49,23 +281,13 @@ class JWTSemanticAnalyzer:
     - Semantic restrictions
     - Temporal validation
     """
+    __slots__ = ('header', 'payload', 'errors', 'warnings', 'symbol_table')
     
     # Registered standard claims (RFC 7519)
-    STANDARD_CLAIMS = {
-        "iss": {"type": str, "description": "Issuer", "required": False},
-        "sub": {"type": str, "description": "Subject", "required": False},
-        "aud": {"type": (str, list), "description": "Audience", "required": False},
-        "exp": {"type": int, "description": "Expiration Time", "required": False},
-        "nbf": {"type": int, "description": "Not Before", "required": False},
-        "iat": {"type": int, "description": "Issued At", "required": False},
-        "jti": {"type": str, "description": "JWT ID", "required": False}
-    }
+    STANDARD_CLAIMS = STANDARD_CLAIMS
     
     # Required header fields
-    REQUIRED_HEADER_FIELDS = {
-        "typ": {"type": str, "description": "Token Type", "expected": "JWT"},
-        "alg": {"type": str, "description": "Algorithm", "allowed": ["HS256", "HS384", "HS512", "RS256", "RS384", "RS512", "ES256", "ES384", "ES512", "none"]}
-    }
+    REQUIRED_HEADER_FIELDS = REQUIRED_HEADER_FIELDS
     
     def __init__(self, header: Dict, payload: Dict):
         self.header = header
@@ -76,178 +298,19 @@ class JWTSemanticAnalyzer:
     
     def analyze(self) -> Dict:
         """
-        Performs complete semantic analysis
+        Performs complete semantic analysis (see analyze_semantics)
         """
-        # Build symbol table
-        self._build_symbol_table()
-        
-        # Validate header
-        header_valid = self._validate_header()
-        
-        # Validate payload
-        payload_valid = self._validate_payload()
-        
-        # Validate data types
-        types_valid = self._validate_types()
-        
-        # Validate temporal restrictions
-        temporal_valid = self._validate_temporal()
-        
-        success = len(self.errors) == 0
-        
-        return {
-            "phase": "Semantic Analysis",
-            "success": success,
-            "validations": {
-                "header": header_valid,
-                "payload": payload_valid,
-                "types": types_valid,
-                "temporal": temporal_valid
-            },
-            "symbol_table": self.symbol_table.to_dict(),
-            "errors": self.errors,
-            "warnings": self.warnings,
-            "statistics": {
-                "total_claims": len(self.symbol_table.symbols),
-                "standard_claims": len([s for s in self.symbol_table.symbols.values() if s["claim_type"] == "standard"]),
-                "private_claims": len([s for s in self.symbol_table.symbols.values() if s["claim_type"] == "private"])
-            }
-        }
-    
-    def _build_symbol_table(self):
-        """Builds symbol table with all claims"""
-        # Add header symbols
-        for key, value in self.header.items():
-            claim_type = "standard" if key in ["typ", "alg", "kid"] else "private"
-            self.symbol_table.add_symbol(key, value, claim_type, "header")
-        
-        # Add payload symbols
-        for key, value in self.payload.items():
-            claim_type = "standard" if key in self.STANDARD_CLAIMS else "private"
-            self.symbol_table.add_symbol(key, value, claim_type, "payload")
+        return _analyze(self.header, self.payload, self.errors, self.warnings, self.symbol_table)
     
-    def _validate_header(self) -> bool:
-        """Validates required fields and header structure"""
-        valid = True
-        
-        # Validate 'typ' field
-        if "typ" not in self.header:
-            self.warnings.append("Missing 'typ' field in header (recommended: 'JWT')")
-        elif self.header["typ"] != "JWT":
-            self.warnings.append(f"Field 'typ' has value '{self.header['typ']}', expected 'JWT'")
-        
-        # Validate 'alg' field (REQUIRED)
-        if "alg" not in self.header:
-            self.errors.append("Required field 'alg' missing in header")
-            valid = False
-        else:
-            alg = self.header["alg"]
-            allowed_algs = self.REQUIRED_HEADER_FIELDS["alg"]["allowed"]
-            if alg not in allowed_algs:
-                self.errors.append(f"Algorithm '{alg}' not recognized. Valid algorithms: {allowed_algs}")
-                valid = False
-        
-        return valid
-    
-    def _validate_payload(self) -> bool:
-        """Validates structure and payload claims"""
-        valid = True
-        
-        # Validate non-empty payload
-        if not self.payload:
-            self.warnings.append("Empty payload: contains no claims")
-        
-        # Validate present standard claims
-        for claim, info in self.STANDARD_CLAIMS.items():
-            if claim in self.payload:
-                expected_type = info["type"]
-                actual_value = self.payload[claim]
-                
-                # Validate type
-                if isinstance(expected_type, tuple):
-                    if not isinstance(actual_value, expected_type):
-                        self.errors.append(f"Claim '{claim}' has incorrect type: {type(actual_value).__name__}, expected {expected_type}")
-                        valid = False
-                else:
-                    if not isinstance(actual_value, expected_type):
-                        self.errors.append(f"Claim '{claim}' has incorrect type: {type(actual_value).__name__}, expected {expected_type.__name__}")
-                        valid = False
-        
-        return valid
-    
-    def _validate_types(self) -> bool:
-        """Validates data types of all claims"""
-        valid = True
-        
-        # Validate types in header
-        for key, value in self.header.items():
-            if key in self.REQUIRED_HEADER_FIELDS:
-                expected_type = self.REQUIRED_HEADER_FIELDS[key]["type"]
-                if not isinstance(value, expected_type):
-                    self.errors.append(f"Header.{key} has incorrect type: {type(value).__name__}, expected {expected_type.__name__}")
-                    valid = False
-        
-        # Validate temporal claim types
-        for temporal_claim in ["exp", "nbf", "iat"]:
-            if temporal_claim in self.payload:
-                value = self.payload[temporal_claim]
-                if not isinstance(value, int):
-                    self.errors.append(f"Temporal claim '{temporal_claim}' must be int (Unix timestamp), found {type(value).__name__}")
-                    valid = False
-        
-        return valid
-    
-    def _validate_temporal(self) -> bool:
-        """Validates temporal restrictions (exp, nbf, iat)"""
-        valid = True
-        now = datetime.now(timezone.utc).timestamp()
-        
-        # Validate expiration (exp)
-        if "exp" in self.payload:
-            exp = self.payload["exp"]
-            if isinstance(exp, int):
-                if exp < now:
-                    self.errors.append(f"Token expired: exp={exp}, now={int(now)}")
-                    valid = False
-            else:
-                self.errors.append(f"Claim 'exp' must be a Unix timestamp (int), found {type(exp).__name__}")
-                valid = False
-        else:
-            self.warnings.append("Token without 'exp' claim: cannot validate expiration")
-        
-        # Validate not before (nbf)
-        if "nbf" in self.payload:
-            nbf = self.payload["nbf"]
-            if isinstance(nbf, int):
-                if nbf > now:
-                    self.errors.append(f"Token not yet valid: nbf={nbf}, now={int(now)}")
-                    valid = False
-            else:
-                self.errors.append(f"Claim 'nbf' must be a Unix timestamp (int), found {type(nbf).__name__}")
-                valid = False
-        
-        # Validate issued at (iat)
-        if "iat" in self.payload:
-            iat = self.payload["iat"]
-            if isinstance(iat, int):
-                if iat > now:
-                    self.warnings.append(f"Claim 'iat' is in the future: iat={iat}, now={int(now)}")
-            else:
-                self.errors.append(f"Claim 'iat' must be a Unix timestamp (int), found {type(iat).__name__}")
-                valid = False
-        
-        # Validate temporal order: iat < nbf < exp
-        if all(k in self.payload for k in ["iat", "nbf", "exp"]):
-            iat = self.payload["iat"]
-            nbf = self.payload["nbf"]
-            exp = self.payload["exp"]
-            
-            if isinstance(iat, int) and isinstance(nbf, int) and isinstance(exp, int):
-                if not (iat <= nbf <= exp):
-                    self.errors.append(f"Invalid temporal order: must satisfy iat <= nbf <= exp, found iat={iat}, nbf={nbf}, exp={exp}")
-                    valid = False
-        
-        return valid
+    def is_valid_fast(self) -> bool:
+        """
+        Checks semantic validity only, stopping at the first validation
+        step that reports an error (no symbol table, no result dict)
+        """
+        if not _validate_header(self.header, self.errors, self.warnings):
+            return False
+        _validate_claims(self.header, self.payload, self.errors, self.warnings)
+        return not self.errors
     
     def get_semantic_rules(self) -> Dict:
         """Returns applied semantic rules"""
@@ -3,6 +3,31 @@ import os
 class Config:
     # Require MONGO_URI via environment; no hardcoded credentials
     MONGO_URI = os.getenv("MONGO_URI")
+    # When False, the app starts without MongoDB if MONGO_URI is missing
+    MONGO_REQUIRED = os.getenv("MONGO_REQUIRED", "True").lower() in ("true", "1", "yes")
+    # Optional final URI computed at deploy time; skips any runtime rewriting
+    MONGO_URI_RESOLVED = os.getenv("MONGO_URI_RESOLVED")
+    # Where resolved mongodb+srv:// seed lists are cached between boots
+    MONGO_SRV_CACHE = os.getenv("MONGO_SRV_CACHE", "/tmp/mongo_uri.cache")
+    # MongoDB client timeouts (ms) and pool size; small values fail fast
+    # instead of holding a worker thread on a bad network
+    MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "2000"))
+    MONGO_CONNECT_TIMEOUT_MS = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "2000"))
+    MONGO_SOCKET_TIMEOUT_MS = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "2000"))
+    MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "1000"))
+    MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "50"))
+    # Warm sockets kept per worker so early requests skip the TLS handshake
+    MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "5"))
+    MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "60000"))
+    # Wire compression, in order of preference
+    MONGO_COMPRESSORS = os.getenv("MONGO_COMPRESSORS", "zstd,zlib")
+    MONGO_APPNAME = os.getenv("MONGO_APPNAME", "lfbackend")
+    # Ping MongoDB (and create indexes) right after create_app; under
+    # gunicorn.conf.py the ping runs in each worker instead of the master
+    MONGO_PING_ON_STARTUP = os.getenv("MONGO_PING_ON_STARTUP", "True").lower() in ("true", "1", "yes")
+    # Page size of GET /api/jwt/tests, and the largest ?limit= accepted
+    TESTS_PAGE_SIZE = int(os.getenv("TESTS_PAGE_SIZE", "100"))
+    TESTS_MAX_PAGE_SIZE = int(os.getenv("TESTS_MAX_PAGE_SIZE", "1000"))
     APP_SECRET = os.getenv("APP_SECRET", "dev_secret_change_this")
     DEBUG = os.getenv("DEBUG", "True").lower() in ("true", "1", "yes")
     ALLOWED_ALGORITHMS = ["HS256", "HS384", "HS512"]
@@ -1,7 +1,70 @@
-from pymongo import MongoClient
-import ssl
-import certifi
+import threading
 
 # Direct PyMongo client to be initialized in create_app
 client = None
 db = None
+# Handle of the test_cases collection, resolved once per client
+test_cases = None
+
+# Set by gunicorn.conf.py while the master preloads the app: the master must
+# not connect, so the startup ping is left to each worker (post_fork)
+preloading = False
+# MONGO_PING_ON_STARTUP of the app, for the ping done after fork
+ping_on_startup = False
+
+# Arguments of the last init_db call, reused to reopen the client after fork
+_client_args = None
+
+
+def init_db(uri, db_name, **options):
+    """Creates the MongoDB client; sockets are opened lazily on first use"""
+    global client, db, test_cases, _client_args
+    # Imported lazily so modules that never touch MongoDB don't load pymongo
+    from pymongo import MongoClient
+
+    _client_args = (uri, db_name, options)
+    client = MongoClient(uri, connect=False, **options)
+    db = client[db_name]
+    test_cases = db.test_cases
+
+
+def reinit_db():
+    """Reopens the client in a forked worker so it gets its own pool"""
+    if _client_args is not None:
+        uri, db_name, options = _client_args
+        init_db(uri, db_name, **options)
+
+
+def close_db():
+    """Closes the client's sockets and monitor threads, keeping its arguments"""
+    if client is not None:
+        client.close()
+
+
+def ensure_indexes():
+    """Creates the indexes the routes rely on (no-op when they exist)"""
+    from pymongo import DESCENDING
+
+    # GET /api/jwt/tests sorts and pages by (created_at, _id), newest first
+    test_cases.create_index([("created_at", DESCENDING), ("_id", DESCENDING)], name="created_at_desc_id_desc")
+
+
+def ping_in_background():
+    """Checks the MongoDB connection and indexes without blocking app startup"""
+    if db is None:
+        return
+    def _ping():
+        try:
+            db.command('ping')
+            print(f"✓ MongoDB connection successful to database: {db.name}")
+        except Exception as e:
+            print(f"✗ MongoDB connection FAILED: {type(e).__name__}: {str(e)[:200]}")
+            print("  → Recommended: Use Render's managed MongoDB instead of Atlas")
+            print("  → Create a MongoDB instance in Render dashboard and use its internal URI")
+            return
+        try:
+            ensure_indexes()
+        except Exception as e:
+            print(f"✗ MongoDB index creation FAILED: {type(e).__name__}: {str(e)[:200]}")
+
+    threading.Thread(target=_ping, name="mongo-ping", daemon=True).start()
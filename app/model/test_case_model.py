@@ -1,5 +1,6 @@
 from dataclasses import dataclass, asdict
-from datetime import datetime
+from datetime import datetime, timezone
+from typing import Optional
 
 @dataclass
 class TestCase:
@@ -7,11 +8,12 @@ class TestCase:
     description: str
     token: str
     result: dict
-    created_at: str = None
+    created_at: Optional[datetime] = None
 
     def __post_init__(self):
         if self.created_at is None:
-            self.created_at = datetime.utcnow().isoformat()
+            # Stored as a BSON date: smaller than an ISO string and sorts natively
+            self.created_at = datetime.now(timezone.utc)
 
     def to_dict(self):
         return asdict(self)
@@ -1,23 +1,65 @@
 from flask import Blueprint, request, jsonify, current_app
 from bson import ObjectId
-from bson.errors import InvalidId
+import orjson
 from datetime import datetime, timedelta, timezone
 
 from app.services.jwt_service import JWTService
 from app.model.test_case_model import TestCase
 from app import extensions
-from app.analyzers.lexer import JWTLexer
-from app.analyzers.parser import JWTParser
-from app.analyzers.semantic import JWTSemanticAnalyzer
+from app.analyzers.lexer import JWTLexer, MAX_JWT_LEN
+from app.analyzers.parser import JWTParser, analyze_fused
+from app.analyzers.semantic import analyze_semantics
+from app.utils.json_provider import static_json
 
 bp = Blueprint('jwt', __name__, url_prefix='/api/jwt')
 
+# Alphabet and grammar blocks of /analyze never change: serialize them once
+_ALPHABET_JSON = static_json(JWTLexer.get_alphabet_info())
+_GRAMMAR_JSON = static_json(JWTParser.get_grammar_info())
+
+# created_at is stored as a date; the API keeps returning it as an ISO string
+_CREATED_AT_ISO = {"$cond": [
+    {"$eq": [{"$type": "$created_at"}, "date"]},
+    {"$dateToString": {"date": "$created_at", "format": "%Y-%m-%dT%H:%M:%S.%L"}},
+    "$created_at"
+]}
+
+# Longest token accepted by any route (same cap as the lexer); larger ones
+# are refused before any decoding, hashing or storage
+MAX_TOKEN_LEN = MAX_JWT_LEN
+
+# Fields dropped from GET /tests?summary=true
+_SUMMARY_PROJECTION = {"_id": 0, "token": 0, "result": 0}
+
+def _error_body(message: str) -> bytes:
+    return orjson.dumps({"error": message})
+
+# Constant error bodies, serialized once at import
+_ERR_MISSING_TOKEN = _error_body("Missing 'token' field")
+_ERR_TOKEN_TOO_LARGE = _error_body("Token too large")
+_ERR_MISSING_TOKEN_OR_SECRET = _error_body("Missing 'token' or 'secret'")
+_ERR_NO_SECRET = _error_body("No secret provided and APP_SECRET is not configured")
+_ERR_MISSING_NAME_OR_TOKEN = _error_body("Missing 'name' or 'token'")
+_ERR_INVALID_AFTER = _error_body("Invalid 'after' id")
+_ERR_AFTER_UNDATED = _error_body("Test given as 'after' has no created_at")
+_ERR_INVALID_TEST_ID = _error_body("Invalid test_id")
+_ERR_DB_UNAVAILABLE = _error_body("Database unavailable")
+
+def _error(body: bytes, status: int):
+    # A new Response every time: after-request hooks (CORS) modify it
+    return current_app.response_class(body, status=status, mimetype="application/json")
+
+def _token_too_large(token) -> bool:
+    return isinstance(token, str) and len(token) > MAX_TOKEN_LEN
+
 @bp.route('/decode', methods=['POST'])
 def decode():
     data = request.get_json() or {}
     token = data.get("token")
     if not token:
-        return jsonify({"error": "Missing 'token' field"}), 400
+        return _error(_ERR_MISSING_TOKEN, 400)
+    if _token_too_large(token):
+        return _error(_ERR_TOKEN_TOO_LARGE, 413)
     try:
         result = JWTService.decode_token_no_verify(token)
         is_valid_sem, sem_errors = JWTService.validate_semantics(result["header"], result["payload"])
@@ -39,7 +81,9 @@ def verify():
     algorithms = data.get("algorithms", current_app.config.get("ALLOWED_ALGORITHMS"))
 
     if not token or not secret:
-        return jsonify({"error": "Missing 'token' or 'secret'"}), 400
+        return _error(_ERR_MISSING_TOKEN_OR_SECRET, 400)
+    if _token_too_large(token):
+        return _error(_ERR_TOKEN_TOO_LARGE, 413)
 
     ok = JWTService.verify_signature(token, secret, algorithms=algorithms)
     return jsonify({"valid_signature": ok})
@@ -66,7 +110,7 @@ def encode():
     if not secret:
         secret = current_app.config.get("APP_SECRET")
         if not secret:
-            return jsonify({"error": "No secret provided and APP_SECRET is not configured"}), 400
+            return _error(_ERR_NO_SECRET, 400)
 
     allowed = current_app.config.get("ALLOWED_ALGORITHMS", [])
     if algorithm not in allowed:
@@ -88,11 +132,17 @@ def save_test():
     token = data.get("token")
     result = data.get("result", {})
     if not name or not token:
-        return jsonify({"error": "Missing 'name' or 'token'"}), 400
+        return _error(_ERR_MISSING_NAME_OR_TOKEN, 400)
+    if _token_too_large(token):
+        return _error(_ERR_TOKEN_TOO_LARGE, 413)
+
+    # Storage is optional (MONGO_REQUIRED=False): no client, no test cases
+    if extensions.test_cases is None:
+        return _error(_ERR_DB_UNAVAILABLE, 503)
 
     try:
         test_case = TestCase(name=name, description=data.get("description",""), token=token, result=result)
-        collection = extensions.db.test_cases
+        collection = extensions.test_cases
         inserted = collection.insert_one(test_case.to_dict())
         return jsonify({"inserted_id": str(inserted.inserted_id), "success": True}), 201
     except Exception as e:
@@ -100,25 +150,66 @@ def save_test():
 
 @bp.route('/tests', methods=['GET'])
 def list_tests():
+    # Newest first, one page at a time: ?limit=N&after=<id of the last test received>
+    limit = request.args.get("limit", type=int) or current_app.config["TESTS_PAGE_SIZE"]
+    limit = max(1, min(limit, current_app.config["TESTS_MAX_PAGE_SIZE"]))
+    after = request.args.get("after")
+    # ?summary=true leaves out the token and result bodies, for list views
+    summary = request.args.get("summary", "").lower() in ("true", "1", "yes")
+    if after is not None and not ObjectId.is_valid(after):
+        return _error(_ERR_INVALID_AFTER, 400)
+    if extensions.test_cases is None:
+        return _error(_ERR_DB_UNAVAILABLE, 503)
+
     try:
-        collection = extensions.db.test_cases
-        cursor = collection.find().sort("created_at", -1)
-        docs = []
-        for d in cursor:
-            d["id"] = str(d.pop("_id"))
-            docs.append(d)
-        return jsonify(docs), 200
+        collection = extensions.test_cases
+        pipeline = []
+        if after is not None:
+            anchor_id = ObjectId(after)
+            anchor = collection.find_one({"_id": anchor_id}, {"created_at": 1})
+            if anchor is None:
+                return jsonify([]), 200
+            created_at = anchor.get("created_at")
+            if created_at is None:
+                return _error(_ERR_AFTER_UNDATED, 400)
+            # Keyset on (created_at, _id): tests sharing the anchor's
+            # timestamp continue from the anchor's _id instead of being skipped
+            older = [
+                {"created_at": {"$lt": created_at}},
+                {"created_at": created_at, "_id": {"$lt": anchor_id}}
+            ]
+            if isinstance(created_at, datetime):
+                # Tests saved before created_at became a date hold an ISO
+                # string; $lt never compares across types, but they are older
+                older.append({"created_at": {"$type": "string"}})
+            pipeline.append({"$match": {"$or": older}})
+        # Sorting, paging and the _id -> id rename all run in MongoDB
+        pipeline.extend((
+            {"$sort": {"created_at": -1, "_id": -1}},
+            {"$limit": limit},
+            {"$addFields": {
+                "id": {"$toString": "$_id"},
+                "created_at": _CREATED_AT_ISO
+            }},
+            {"$project": _SUMMARY_PROJECTION if summary else {"_id": 0}}
+        ))
+        # A whole page comes back in the first batch: one round trip. Query
+        # errors surface here; the documents are then encoded as they are sent
+        cursor = collection.aggregate(pipeline, batchSize=limit)
+        return current_app.json.response_stream(cursor), 200
     except Exception as e:
         print(f"Error fetching tests: {str(e)}")
         return jsonify([]), 200
 
 @bp.route('/tests/<test_id>', methods=['DELETE'])
 def delete_test(test_id):
-    collection = extensions.db.test_cases
-    try:
-        res = collection.delete_one({"_id": ObjectId(test_id)})
-    except InvalidId:
-        return jsonify({"error": "Invalid test_id"}), 400
+    # Reject malformed ids before building an ObjectId or reaching MongoDB
+    if not ObjectId.is_valid(test_id):
+        return _error(_ERR_INVALID_TEST_ID, 400)
+    collection = extensions.test_cases
+    if collection is None:
+        return _error(_ERR_DB_UNAVAILABLE, 503)
+    res = collection.delete_one({"_id": ObjectId(test_id)})
     return jsonify({"deleted_count": res.deleted_count})
 
 
@@ -132,7 +223,9 @@ def analyze_jwt():
     token = data.get("token")
     
     if not token:
-        return jsonify({"error": "Missing 'token' field"}), 400
+        return _error(_ERR_MISSING_TOKEN, 400)
+    if _token_too_large(token):
+        return _error(_ERR_TOKEN_TOO_LARGE, 413)
     
     result = {
         "token": token,
@@ -140,9 +233,9 @@ def analyze_jwt():
     }
     
     try:
-        # PHASE 1: Lexical Analysis
-        lexer = JWTLexer(token)
-        lexical_analysis = lexer.analyze()
+        # PHASES 1-2: Lexical and Syntactic Analysis (fused single pass)
+        lexical_analysis, syntactic_analysis = analyze_fused(token)
+        lexical_analysis["alphabet"] = _ALPHABET_JSON
         result["phases"]["lexical"] = lexical_analysis
         
         # If lexical analysis fails, don't continue
@@ -151,9 +244,7 @@ def analyze_jwt():
             result["message"] = "Lexical analysis failed"
             return jsonify(result), 200
         
-        # PHASE 2: Syntactic Analysis
-        parser = JWTParser(lexer.tokens)
-        syntactic_analysis = parser.analyze()
+        syntactic_analysis["grammar"] = _GRAMMAR_JSON
         result["phases"]["syntactic"] = syntactic_analysis
         
         # If syntactic analysis fails, don't continue
@@ -163,13 +254,14 @@ def analyze_jwt():
             return jsonify(result), 200
         
         # PHASE 3: Semantic Analysis
-        # Decode header and payload for semantic analysis
-        decoded = JWTService.decode_token_no_verify(token)
+        # Decode header and payload for semantic analysis, reusing the
+        # segments the lexer already delimited instead of splitting again
+        tokens = lexical_analysis["tokens"]
+        decoded = JWTService.decode_segments(tokens[0]["value"], tokens[2]["value"], tokens[4]["value"])
         header = decoded["header"]
         payload = decoded["payload"]
         
-        semantic_analyzer = JWTSemanticAnalyzer(header, payload)
-        semantic_analysis = semantic_analyzer.analyze()
+        semantic_analysis = analyze_semantics(header, payload)
         result["phases"]["semantic"] = semantic_analysis
         
         # Add decoded information
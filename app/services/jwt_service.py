@@ -1,61 +1,294 @@
+import hashlib
+import hmac
 import json
+import re
+import threading
+import time
+from collections import OrderedDict
 import jwt
-from flask import current_app
+import orjson
+from flask import current_app, has_app_context
+from jwt.algorithms import HMACAlgorithm
+from app.analyzers.lexer import JWT_RE, JWT_SHAPE_RE
 from app.utils import base64url
 
+# validate_semantics rules: required header fields and numeric claims,
+# with their error messages, in reporting order
+_HEADER_REQUIRED = (
+    ("alg", "Missing 'alg' in header"),
+    ("typ", "Missing 'typ' in header")
+)
+_NUMERIC_CLAIMS = (
+    ("exp", "'exp' must be numeric (timestamp)"),
+    ("iat", "'iat' must be numeric (timestamp)")
+)
+_MISSING = object()
+
+# 19+ digits in a row: a number orjson may not hold as an exact int
+_LONG_DIGITS = re.compile(rb'[0-9]{19}')
+
+# Algorithms accepted when the app config doesn't list any
+_DEFAULT_ALGS = ("HS256",)
+
+# Recent signature checks: (sha256(token), sha256(secret), algorithms) ->
+# (valid, expires_at). Keyed on digests so no raw secret is kept in memory;
+# an entry lives at most _VERIFY_CACHE_TTL seconds and never past the
+# token's own exp claim
+_VERIFY_CACHE_SIZE = 4096
+_VERIFY_CACHE_TTL = 300
+_verify_cache = OrderedDict()
+_verify_lock = threading.Lock()
+
+
+def _verify_cache_key(token, secret, algorithms):
+    """Cache key of a verification, or None if the arguments can't form one"""
+    try:
+        key = (
+            hashlib.sha256(token.encode('utf-8')).digest(),
+            hashlib.sha256(secret.encode('utf-8')).digest(),
+            tuple(algorithms)
+        )
+        hash(key)
+        return key
+    except (AttributeError, TypeError):
+        return None
+
+
+def _verify_cache_get(key, now):
+    """Returns the cached result for key, or None when missing or expired"""
+    with _verify_lock:
+        entry = _verify_cache.get(key)
+        if entry is None:
+            return None
+        valid, expires_at = entry
+        if expires_at <= now:
+            del _verify_cache[key]
+            return None
+        _verify_cache.move_to_end(key)
+        return valid
+
+
+def _verify_cache_put(key, valid, expires_at):
+    """Stores a result, evicting the least recently used entry when full"""
+    with _verify_lock:
+        _verify_cache[key] = (valid, expires_at)
+        _verify_cache.move_to_end(key)
+        if len(_verify_cache) > _VERIFY_CACHE_SIZE:
+            _verify_cache.popitem(last=False)
+
+
+# Key preparation of jwt.decode for HS256 (rejects PEM/SSH-looking secrets)
+_HS256 = HMACAlgorithm(HMACAlgorithm.SHA256)
+
+
+# APP_SECRET and an HMAC-SHA256 object keyed with it, as (key, template):
+# only the server's own secret is kept pre-keyed, never caller-supplied ones
+_app_secret_hmac = None
+
+
+def _hs256_hmac(secret):
+    """
+    HMAC-SHA256 object keyed with a secret and fed no data yet. For
+    APP_SECRET it is a copy of a template prepared once, which skips the
+    key preparation and key schedule; other secrets are keyed afresh
+    """
+    global _app_secret_hmac
+    cached = _app_secret_hmac
+    if (cached is not None and isinstance(secret, str)
+            and hmac.compare_digest(cached[0], secret.encode('utf-8'))):
+        return cached[1].copy()
+    key = _HS256.prepare_key(secret)
+    mac = hmac.new(key, digestmod=hashlib.sha256)
+    app_secret = current_app.config.get("APP_SECRET") if has_app_context() else None
+    if isinstance(app_secret, str) and hmac.compare_digest(app_secret.encode('utf-8'), key):
+        _app_secret_hmac = (key, mac.copy())
+    return mac
+
+
+# Header fields the HS256 fast path knows jwt.decode does not act on
+_HS256_HEADER_FIELDS = frozenset(("alg", "typ"))
+
+
+# Unpadded base64url length of the signature of each HMAC algorithm
+_HS_SIGNATURE_LENGTHS = {"HS256": 43, "HS384": 64, "HS512": 86}
+
+
+def _may_verify(match, algorithms) -> bool:
+    """
+    Structural precheck, without decoding anything: False when a str
+    token is not three unpadded base64url segments (match is None) or,
+    if only HMAC algorithms are allowed, its signature has none of their
+    lengths
+    """
+    if match is None:
+        return False
+    try:
+        lengths = {_HS_SIGNATURE_LENGTHS[alg] for alg in algorithms}
+    except (KeyError, TypeError):
+        # Other algorithms: their signature size depends on the key
+        return True
+    return len(match.group(3)) in lengths
+
+
+def _verify_hs256(match, secret, algorithms):
+    """
+    Verifies an HS256 token (as matched by JWT_RE) with hmac/hashlib
+    directly, skipping PyJWT's generic decode path. Returns the payload
+    if the token verifies, False if it doesn't, and None when it must go
+    through jwt.decode instead (other algorithms, extra header fields,
+    claims PyJWT validates)
+    """
+    try:
+        if match is None or "HS256" not in algorithms:
+            return None
+        header_b64, payload_b64, signature_b64 = match.groups()
+        header = json.loads(base64url.base64url_decode(header_b64))
+        if (not isinstance(header, dict) or header.get("alg") != "HS256"
+                or not header.keys() <= _HS256_HEADER_FIELDS):
+            return None
+        mac = _hs256_hmac(secret)
+        signature = base64url.base64url_decode(signature_b64)
+    except (TypeError, ValueError, jwt.InvalidKeyError):
+        return None
+
+    mac.update(f"{header_b64}.{payload_b64}".encode('ascii'))
+    if not hmac.compare_digest(mac.digest(), signature):
+        return False
+
+    try:
+        payload = json.loads(base64url.base64url_decode(payload_b64))
+    except ValueError:
+        return False
+    if not isinstance(payload, dict):
+        return False
+
+    # Claims jwt.decode still checks with verify_exp off: leave any token
+    # carrying them in a questionable state to PyJWT
+    if "aud" in payload:
+        return None
+    now = time.time()
+    for claim in ("iat", "nbf"):
+        if claim in payload:
+            value = payload[claim]
+            if not (isinstance(value, int) and value <= now):
+                return None
+    for claim in ("sub", "jti"):
+        if claim in payload and not isinstance(payload[claim], str):
+            return None
+    return payload
+
+
+def _loads_json(data: bytes):
+    """
+    Parses a decoded segment with orjson, straight from the UTF-8 bytes.
+    Whatever orjson would reject or alter (NaN, lone surrogates, integers
+    wider than 64 bits, which it turns into floats) goes through the
+    stdlib parser instead, so the claims shown are exactly the token's
+    """
+    if _LONG_DIGITS.search(data) is None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data.decode('utf-8'))
+
+
 class JWTService:
 
     @staticmethod
     def decode_token_no_verify(token: str):
-        parts = token.split('.')
-        if len(parts) != 3:
-            raise ValueError("Malformed token: must contain 3 parts separated by '.'")
+        # One regex pass validates and splits: malformed tokens never
+        # reach the base64 and JSON decoders
+        match = JWT_SHAPE_RE.fullmatch(token)
+        if match is None:
+            if token.count('.') != 2:
+                raise ValueError("Malformed token: must contain 3 parts separated by '.'")
+            raise ValueError("Malformed token: parts must be unpadded Base64URL")
+        return JWTService.decode_segments(*match.groups())
 
-        header_b = base64url.base64url_decode(parts[0])
-        payload_b = base64url.base64url_decode(parts[1])
+    @staticmethod
+    def decode_segments(header_b64: str, payload_b64: str, signature_b64: str):
+        """decode_token_no_verify for a token already split into its segments"""
+        header_b = base64url.base64url_decode(header_b64)
+        payload_b = base64url.base64url_decode(payload_b64)
         try:
-            header = json.loads(header_b.decode('utf-8'))
-            payload = json.loads(payload_b.decode('utf-8'))
+            header = _loads_json(header_b)
+            payload = _loads_json(payload_b)
         except Exception as e:
             raise ValueError(f"Invalid JSON structure: {e}")
 
         return {
             "header": header,
             "payload": payload,
-            "signature_b64url": parts[2]
+            "signature_b64url": signature_b64
         }
 
     @staticmethod
     def verify_signature(token: str, secret: str, algorithms=None) -> bool:
         if algorithms is None:
-            algorithms = current_app.config.get("ALLOWED_ALGORITHMS", ["HS256"])
+            algorithms = current_app.config.get("ALLOWED_ALGORITHMS", _DEFAULT_ALGS)
+
+        # Malformed tokens are rejected before any hashing or decoding
+        match = None
+        if isinstance(token, str):
+            match = JWT_RE.fullmatch(token)
+            if not _may_verify(match, algorithms):
+                return False
+
+        # Repeated checks of the same token and secret skip decode and HMAC
+        key = _verify_cache_key(token, secret, algorithms)
+        now = time.time()
+        if key is not None:
+            cached = _verify_cache_get(key, now)
+            if cached is not None:
+                return cached
+
+        expires_at = now + _VERIFY_CACHE_TTL
         try:
-            jwt.decode(token, secret, algorithms=algorithms, options={"verify_exp": False})
-            return True
-        except (jwt.InvalidSignatureError, jwt.DecodeError):
+            # HS256 tokens are checked without PyJWT when possible
+            payload = _verify_hs256(match, secret, algorithms)
+            if payload is None:
+                payload = jwt.decode(token, secret, algorithms=algorithms, options={"verify_exp": False})
+            valid = payload is not False
+            exp = payload.get("exp") if isinstance(payload, dict) else None
+            if isinstance(exp, (int, float)) and not isinstance(exp, bool):
+                expires_at = min(expires_at, exp)
+        except jwt.ImmatureSignatureError:
+            # nbf or iat still in the future: the same token may verify in
+            # a moment, so this result is not cached
             return False
+        except (jwt.InvalidSignatureError, jwt.DecodeError):
+            valid = False
         except Exception:
-            return False
+            valid = False
+
+        if key is not None and expires_at > now:
+            _verify_cache_put(key, valid, expires_at)
+        return valid
 
     @staticmethod
     def create_token(header: dict, payload: dict, secret: str, algorithm: str = "HS256") -> str:
-        if algorithm not in current_app.config.get("ALLOWED_ALGORITHMS", ["HS256"]):
+        # Frozen set built by create_app: O(1) lookup, no list per call
+        if algorithm not in current_app.config.get("ALLOWED_ALGORITHMS_SET", _DEFAULT_ALGS):
             raise ValueError("Algorithm not allowed")
         return jwt.encode(payload, secret, algorithm=algorithm, headers=header)
 
     @staticmethod
     def validate_semantics(header: dict, payload: dict):
         errors = []
-        if not isinstance(header, dict):
+        header_is_dict = isinstance(header, dict)
+        payload_is_dict = isinstance(payload, dict)
+        if not header_is_dict:
             errors.append("Header must be a JSON object")
-        if not isinstance(payload, dict):
+        if not payload_is_dict:
             errors.append("Payload must be a JSON object")
-        if "alg" not in header:
-            errors.append("Missing 'alg' in header")
-        if "typ" not in header:
-            errors.append("Missing 'typ' in header")
-        if "exp" in payload and not isinstance(payload["exp"], (int, float)):
-            errors.append("'exp' must be numeric (timestamp)")
-        if "iat" in payload and not isinstance(payload["iat"], (int, float)):
-            errors.append("'iat' must be numeric (timestamp)")
+        # Field checks only apply to objects: a str or list header would
+        # otherwise be searched by substring/element, and a number crash
+        if header_is_dict:
+            errors.extend(message for field, message in _HEADER_REQUIRED if field not in header)
+        if payload_is_dict:
+            for claim, message in _NUMERIC_CLAIMS:
+                value = payload.get(claim, _MISSING)
+                if value is not _MISSING and not isinstance(value, (int, float)):
+                    errors.append(message)
         return (len(errors) == 0, errors)
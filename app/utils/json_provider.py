@@ -0,0 +1,94 @@
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+
+# Source object of each pre-serialized block, for the stdlib fallback
+_static_sources = {}
+
+
+def static_json(obj) -> orjson.Fragment:
+    """
+    Serializes a constant block once (keys sorted, as the provider emits
+    them). Placed in a response, its bytes are copied verbatim instead of
+    being encoded again on every request.
+    """
+    fragment = orjson.Fragment(orjson.dumps(obj, option=orjson.OPT_SORT_KEYS))
+    _static_sources[id(fragment)] = obj
+    return fragment
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson (C/Rust, several times faster than
+    the stdlib encoder). Falls back to the default provider for values
+    orjson rejects, such as integers wider than 64 bits.
+    """
+
+    @staticmethod
+    def default(o):
+        # Only reached on the stdlib fallback path; orjson writes fragments itself
+        if isinstance(o, orjson.Fragment):
+            return _static_sources[id(o)]
+        return DefaultJSONProvider.default(o)
+
+    def _dumps_bytes(self, obj, option: int, sort_keys: bool | None = None) -> bytes:
+        if sort_keys is None:
+            sort_keys = self.sort_keys
+        # Non-string keys are stringified like the stdlib encoder does,
+        # instead of sending the whole object down the slow fallback
+        option |= orjson.OPT_NON_STR_KEYS
+        # Dates go through default(), which formats them as HTTP dates like
+        # Flask does, rather than orjson's native RFC 3339
+        option |= orjson.OPT_PASSTHROUGH_DATETIME
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(obj, default=self.default, option=option)
+        except TypeError:
+            indent = 2 if option & orjson.OPT_INDENT_2 else None
+            return super().dumps(obj, indent=indent, sort_keys=sort_keys).encode('utf-8')
+
+    def dumps(self, obj, **kwargs) -> str:
+        # indent=2 and sort_keys map to orjson options; any other argument
+        # (default, separators, another indent...) needs the stdlib encoder
+        indent = kwargs.pop("indent", None)
+        sort_keys = kwargs.pop("sort_keys", None)
+        if kwargs or indent not in (None, 2):
+            if sort_keys is not None:
+                kwargs["sort_keys"] = sort_keys
+            return super().dumps(obj, indent=indent, **kwargs)
+        option = orjson.OPT_INDENT_2 if indent else 0
+        return self._dumps_bytes(obj, option, sort_keys).decode('utf-8')
+
+    def _indent_option(self) -> int:
+        # Pretty-printed in debug mode unless compact is set, as in Flask
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            return orjson.OPT_INDENT_2
+        return 0
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            self._dumps_bytes(obj, self._indent_option()), mimetype=self.mimetype
+        )
+
+    def response_stream(self, items):
+        """
+        JSON array response encoded one item at a time while it is sent,
+        e.g. straight from a database cursor, so neither the full list nor
+        its full encoding is held in memory. Same JSON as response(list);
+        indented (debug) output is still built in one piece.
+        """
+        if self._indent_option():
+            return self.response(list(items))
+        return self._app.response_class(self._stream_array(items), mimetype=self.mimetype)
+
+    def _stream_array(self, items):
+        yield b'['
+        first = True
+        for item in items:
+            if not first:
+                yield b','
+            first = False
+            yield self._dumps_bytes(item, 0)
+        yield b']'
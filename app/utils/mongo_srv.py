@@ -0,0 +1,151 @@
+"""
+Resolution of mongodb+srv:// URIs into a plain mongodb:// seed list.
+
+The SRV and TXT lookups are cached on disk for as long as their DNS TTL
+allows, so later boots (and every gunicorn worker) connect without going
+through DNS again. Credentials are never written to the cache, only hosts
+and options. Since PyMongo does not poll SRV records of a plain mongodb://
+URI, host changes are picked up on the next boot after the TTL expires.
+"""
+import json
+import os
+import re
+import tempfile
+import time
+
+import dns.resolver
+
+SRV_SCHEME = "mongodb+srv://"
+DEFAULT_SRV_SERVICE = "mongodb"
+
+# The authority (userinfo@host) ends at the first '/' or '?'
+_AUTHORITY_END = re.compile(r'[/?]')
+
+# Shared resolver with an in-process cache, created on first lookup
+_resolver = None
+
+
+def resolve_srv_uri(uri: str, cache_path: str) -> str:
+    """
+    Returns an equivalent mongodb:// URI for a mongodb+srv:// one.
+    Any other URI is returned unchanged, as is the original URI if the
+    lookup fails (PyMongo will then resolve the SRV record itself) or if
+    it sets srvMaxHosts, which only PyMongo can apply (it picks a random
+    subset of the hosts, and the option is rejected on mongodb:// URIs).
+    """
+    if not uri or not uri.startswith(SRV_SCHEME):
+        return uri
+
+    rest = uri[len(SRV_SCHEME):]
+    end = _AUTHORITY_END.search(rest)
+    end = end.start() if end else len(rest)
+    # Only the authority may hold the userinfo '@'; options may contain '@' too
+    creds, _, host = rest[:end].rpartition('@')
+    tail = rest[end + 1:] if rest[end:end + 1] == '/' else rest[end:]
+    path, _, query = tail.partition('?')
+
+    uri_options = {}
+    for pair in filter(None, query.split('&')):
+        key, _, value = pair.partition('=')
+        uri_options[key.lower()] = (key, value)
+    if "srvmaxhosts" in uri_options:
+        return uri
+    # srvServiceName picks the SRV record; like srvMaxHosts it is only
+    # valid on mongodb+srv:// URIs, so it is not carried over
+    service = uri_options.pop("srvservicename", (None, DEFAULT_SRV_SERVICE))[1]
+
+    try:
+        seeds, txt_options = _cached_lookup(host, service, cache_path)
+    except Exception as e:
+        print(f"✗ SRV resolution failed for {host}: {type(e).__name__}")
+        return uri
+
+    # Options given in the URI take precedence over the TXT record ones
+    options = {}
+    for pair in filter(None, txt_options.split('&')):
+        key, _, value = pair.partition('=')
+        options[key.lower()] = (key, value)
+    options.update(uri_options)
+    # mongodb+srv:// implies TLS unless explicitly disabled
+    if "tls" not in options and "ssl" not in options:
+        options["tls"] = ("tls", "true")
+
+    query = '&'.join(f"{key}={value}" for key, value in options.values())
+    userinfo = f"{creds}@" if creds else ""
+    return f"mongodb://{userinfo}{seeds}/{path}?{query}"
+
+
+def _cached_lookup(host: str, service: str, cache_path: str):
+    """
+    Returns (seed list, TXT options) for host, from cache while the DNS
+    TTL of the records has not expired
+    """
+    cache = {}
+    try:
+        with open(cache_path) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        pass
+
+    now = time.time()
+    name = f"_{service}._tcp.{host}"
+    entry = cache.get(name)
+    if isinstance(entry, dict) and entry.get("expires", 0) > now:
+        return entry["seeds"], entry["options"]
+
+    seeds, options, ttl = _lookup(host, service)
+    cache[name] = {"seeds": seeds, "options": options, "expires": now + ttl}
+    _write_cache(cache, cache_path)
+    return seeds, options
+
+
+def _write_cache(cache: dict, cache_path: str):
+    """
+    Writes the cache through a temporary file replaced in one step, so
+    concurrent workers or a crash never leave a truncated file behind
+    """
+    tmp_path = None
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path) or ".", suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        if tmp_path:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+
+def _get_resolver():
+    """Returns the shared resolver, so repeated lookups hit its LRU cache"""
+    global _resolver
+    if _resolver is None:
+        _resolver = dns.resolver.Resolver()
+        _resolver.cache = dns.resolver.LRUCache()
+    return _resolver
+
+
+def _lookup(host: str, service: str):
+    """
+    Resolves the SRV and TXT records of a mongodb+srv:// host; returns
+    (seed list, TXT options, shortest TTL of the records in seconds)
+    """
+    resolver = _get_resolver()
+    answers = resolver.resolve(f"_{service}._tcp.{host}", "SRV")
+    seeds = ','.join(
+        f"{str(record.target).rstrip('.')}:{record.port}" for record in answers
+    )
+    ttl = answers.rrset.ttl
+
+    try:
+        txt = resolver.resolve(host, "TXT")
+        options = '&'.join(
+            b''.join(record.strings).decode('utf-8') for record in txt
+        )
+        ttl = min(ttl, txt.rrset.ttl)
+    except (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN):
+        options = ""
+
+    return seeds, options, ttl
@@ -0,0 +1,37 @@
+# Gunicorn settings, picked up automatically from the working directory
+import os
+
+from app import extensions
+
+# Build the app once in the master; workers inherit it on fork
+preload_app = True
+# The preloading master must not connect to MongoDB: create_app skips the
+# startup ping and each worker runs it after fork (post_fork) instead
+extensions.preloading = preload_app
+
+# Threaded workers: requests block on MongoDB, not on CPU, so a few
+# processes with several threads each keep every core busy. Set
+# GUNICORN_WORKER_CLASS=gevent (with gevent installed) for green threads
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+threads = int(os.getenv("GUNICORN_THREADS", "8"))
+# Concurrent clients per worker, for the gevent/eventlet worker classes
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", "1000"))
+# Keep client connections open between requests (behind Render's proxy)
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+
+
+def pre_fork(server, worker):
+    # The master never serves requests: close its client before forking so
+    # no worker inherits live sockets and the master holds no connections
+    extensions.close_db()
+
+
+def post_fork(server, worker):
+    # PyMongo clients are not fork-safe: with --preload the client created
+    # in the master must be reopened so each worker owns its connection pool
+    # Without preloading the app is built after this hook and pings itself
+    extensions.preloading = False
+    extensions.reinit_db()
+    if extensions.ping_on_startup:
+        extensions.ping_in_background()